@@ -49,7 +49,7 @@ def main(debug: bool = False) -> int:
 
     # Write XML trees and dictionaries to files
     try:
-        xml_trees["combined_items"].write(version_dir / "combined_items.xml", encoding="utf-8", xml_declaration=True)
+        xml_trees["combined_items"].write(str(version_dir / "combined_items.xml"), encoding="utf-8", xml_declaration=True)
         write_json(version_dir / "text_ui_dict.json", text_ui_dict, indent=4)
         write_json(version_dir / "combined_dict.json", combined_dict, indent=4)
     except Exception as e:
@@ -64,12 +64,13 @@ def main(debug: bool = False) -> int:
         logger.error("Failed to parse items")
         return 1
     
-    # Write parsed items to a file
-    try:
-        write_json(version_dir / "parsed_items.json", parsed_items, indent=4)
-    except Exception as e:
-        logger.error(f"Failed to write parsed items to file: {e}")
-        return 1
+    # Write parsed items to a file (debug runs only; used by data_analysis)
+    if debug:
+        try:
+            write_json(version_dir / "parsed_items.json", parsed_items, indent=4)
+        except Exception as e:
+            logger.error(f"Failed to write parsed items to file: {e}")
+            return 1
 
     # s05_fill_items.py
     # Filling out categorization keys
@@ -1,6 +1,6 @@
 from pathlib import Path
 import traceback
-from typing import Dict, Any, Optional, cast
+from typing import Dict, Any, Optional, Tuple, cast
 from utils import logger, read_json, ensure_dir, write_json
 
 def get_version(root_dir: Path, kcd2_dir: Path) -> Optional[str]:
@@ -162,10 +162,12 @@ def is_version_different(latest: Dict[str, Any], preset_data: Dict[str, Any]) ->
     if not latest:
         return False
         
-    return (latest.get("Id") != preset_data.get("Id") or
-            latest.get("Name") != preset_data.get("Name") or
-            latest.get("Branch", {}).get("Id") != preset_data.get("Branch", {}).get("Id") or
-            latest.get("Branch", {}).get("Name") != preset_data.get("Branch", {}).get("Name"))
+    return _version_key(latest) != _version_key(preset_data)
+
+def _version_key(version_data: Dict[str, Any]) -> Tuple[Any, Any, Any, Any]:
+    """Return the (Id, Name, Branch.Id, Branch.Name) fields that identify a version."""
+    branch = version_data.get("Branch", {})
+    return (version_data.get("Id"), version_data.get("Name"), branch.get("Id"), branch.get("Name"))
 
 # This allows the module to be run directly for testing
 if __name__ == "__main__":
@@ -63,9 +63,10 @@ def init_data_json(root_dir: Path, version_id: str) -> Optional[Dict[str, Any]]:
             
             # Populate the armor types with the appropriate filters
             for armor_type in data.get("armorTypes", []):
-                if "name" in armor_type and armor_type["name"] in filters:
-                    armor_type["filters"] = filters[armor_type["name"]]
-                    logger.debug(f"Added {len(armor_type['filters'])} filters to {armor_type['name']}")
+                armor_filters = filters.get(armor_type.get("name"))
+                if armor_filters is not None:
+                    armor_type["filters"] = armor_filters
+                    logger.debug(f"Added {len(armor_filters)} filters to {armor_type['name']}")
         
         # 3. Load version info from version.json
         version_json_path = root_dir / "data" / "version.json"
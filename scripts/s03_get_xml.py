@@ -1,12 +1,17 @@
 import zipfile
-import hashlib
-import shutil
 import sys
-import xml.etree.ElementTree as ET
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Tuple, Optional, Any, List, Mapping
-from utils import logger, read_json, write_json, ensure_dir
+from utils import logger, read_json_cached, write_json, ensure_dir
+
+try:
+    # lxml parses and serializes several times faster and mirrors the ElementTree API
+    from lxml import etree as ET  # type: ignore[import-untyped]
+except ImportError:
+    import xml.etree.ElementTree as ET  # type: ignore[no-redef]
 
 def get_xml(root_dir: Path, version_id: str, kcd2_dir: Path) -> Dict[str, ET.ElementTree]:
     """
@@ -33,13 +38,13 @@ def get_xml(root_dir: Path, version_id: str, kcd2_dir: Path) -> Dict[str, ET.Ele
         version_dir = root_dir / "data" / "version" / version_id
         
         # Load XML configuration
-        xml_config = read_json(root_dir / "config" / "xml_files.json")
+        xml_config = read_json_cached(root_dir / "config" / "xml_files.json")
         if not xml_config:
             logger.error("Failed to load XML configuration")
             return {}
         
         # Extract XML files
-        extracted_files, xml_dir, temp_dir = extract_xml_files(kcd2_dir, version_dir, xml_config)
+        extracted_files, xml_dir, parsed_roots = extract_xml_files(kcd2_dir, version_dir, xml_config)
         if not extracted_files:
             logger.error("No XML files were successfully extracted")
             return {}
@@ -47,10 +52,10 @@ def get_xml(root_dir: Path, version_id: str, kcd2_dir: Path) -> Dict[str, ET.Ele
         # Create combined items file if we have the base item.xml
         if "item" in extracted_files:
             logger.info("Combining items from XML files...")
-            combined_root, combined_path = create_combined_items_file(extracted_files, xml_dir)
+            combined_root, combined_path = create_combined_items_file(extracted_files, xml_dir, parsed_roots)
             if combined_root is not None and combined_path is not None:
                 xml_trees["combined_items"] = ET.ElementTree(combined_root)
-                logger.debug(f"Added combined_items to XML trees from {combined_path}")
+                logger.debug("Added combined_items to XML trees from %s", combined_path)
             else:
                 logger.error("Failed to create combined items file")
                 return {}
@@ -62,15 +67,12 @@ def get_xml(root_dir: Path, version_id: str, kcd2_dir: Path) -> Dict[str, ET.Ele
         if "text_ui_items" in extracted_files:
             try:
                 text_ui_path = extracted_files["text_ui_items"]
-                xml_trees["text_ui_items"] = ET.parse(text_ui_path)
-                logger.debug(f"Added text_ui_items to XML trees from {text_ui_path}")
+                xml_trees["text_ui_items"] = ET.ElementTree(load_xml_root("text_ui_items", text_ui_path, parsed_roots))
+                logger.debug("Added text_ui_items to XML trees from %s", text_ui_path)
             except Exception as e:
                 logger.error(f"Failed to parse text_ui_items.xml: {e}")
                 return {}
         
-        # Clean up temp directory
-        clean_directory(temp_dir)
-        
         # Final validation
         required_keys = ["combined_items", "text_ui_items"]
         missing_keys = [key for key in required_keys if key not in xml_trees]
@@ -83,72 +85,10 @@ def get_xml(root_dir: Path, version_id: str, kcd2_dir: Path) -> Dict[str, ET.Ele
         
     except Exception as e:
         logger.error(f"Critical error in get_xml: {e}")
-        import traceback
-        logger.debug(traceback.format_exc())
+        logger.debug("Exception details:", exc_info=True)
         return {}
 
-def compute_file_hash(file_path: Path) -> str:
-    """
-    Compute SHA-256 hash of a file.
-    
-    Args:
-        file_path: Path to the file to hash
-        
-    Returns:
-        Hexadecimal digest of the file's SHA-256 hash
-    """
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        # Read in chunks to avoid loading large files into memory
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
-
-def convert_element(item: ET.Element, target_type: str) -> ET.Element:
-    """
-    Convert an XML element to a different element type, preserving attributes and children.
-    
-    Args:
-        item: Source XML element to convert
-        target_type: Target element type (tag name)
-        
-    Returns:
-        New XML element with the target type and copied attributes/children
-    """
-    new_element = ET.Element(target_type)
-    
-    # Copy all attributes
-    for key, value in item.attrib.items():
-        new_element.set(key, value)
-    
-    # Copy all child elements
-    for child in item:
-        new_element.append(child)
-    
-    return new_element
-
-def clean_directory(directory: Optional[Path]) -> None:
-    """
-    Clean all files and subdirectories from a directory.
-    
-    Args:
-        directory: Path to the directory to clean
-    """
-    if directory is None or not directory.exists():
-        logger.debug(f"Directory doesn't exist or is None, nothing to clean: {directory}")
-        return
-        
-    try:
-        for item in directory.iterdir():
-            if item.is_file():
-                item.unlink()
-            elif item.is_dir():
-                shutil.rmtree(item)
-        logger.debug(f"Cleaned directory: {directory}")
-    except Exception as e:
-        logger.warning(f"Failed to clean directory {directory}: {e}")
-
-def extract_xml_files(kcd2_dir: Path, version_dir: Path, xml_config: Mapping[str, Any]) -> Tuple[Dict[str, Path], Optional[Path], Optional[Path]]:
+def extract_xml_files(kcd2_dir: Path, version_dir: Path, xml_config: Mapping[str, Any]) -> Tuple[Dict[str, Path], Optional[Path], Dict[str, ET.Element]]:
     """
     Extract XML files from PAK files based on configuration.
     
@@ -161,17 +101,23 @@ def extract_xml_files(kcd2_dir: Path, version_dir: Path, xml_config: Mapping[str
         Tuple containing:
         - Dictionary mapping XML names to their file paths
         - Path to the XML directory
-        - Path to the temporary directory
+        - Dictionary of root elements parsed while extracting, keyed by XML name
     """
     # Ensure directories exist
     xml_dir = ensure_dir(version_dir / "xml")
-    temp_dir = ensure_dir(version_dir / "xml" / "temp")
     raw_dir = ensure_dir(version_dir / "xml" / "raw")
+    if raw_dir is None:
+        logger.error("Failed to create raw XML directory")
+        return {}, xml_dir, {}
     
     # Load hash file
     hash_file = version_dir / "xml" / "file_hashes.json"
-    existing_hashes = read_json(hash_file) or {}
-    new_hashes: Dict[str, Dict[str, str]] = {}
+    # Copy the cached dict since the new records are merged into it below
+    existing_hashes = dict(read_json_cached(hash_file) or {})
+    new_hashes: Dict[str, Dict[str, Any]] = {}
+    run_ts = datetime.now().isoformat()
+    parsed_roots: Dict[str, ET.Element] = {}
+    results_lock = threading.Lock()
     
     # Extract XML files
     extracted_files: Dict[str, Path] = {}
@@ -196,53 +142,108 @@ def extract_xml_files(kcd2_dir: Path, version_dir: Path, xml_config: Mapping[str
         logger.info(f"Extracting XML files: {pak_names}...")
     else:
         logger.warning("No valid PAK files found to extract")
-        return {}, xml_dir, temp_dir
+        return {}, xml_dir, {}
 
-    for pak_path, pak_info in valid_pak_files:
-        try:
-            with zipfile.ZipFile(pak_path, 'r') as pak_file:
-                # Process each XML to extract
+    # Several config entries may point at the same PAK; open each one only once
+    pak_cache: Dict[Path, zipfile.ZipFile] = {}
+    tasks: List[Tuple[zipfile.ZipFile, Dict[str, Any], zipfile.ZipInfo, str]] = []
+    # Hash records are keyed relative to the data root; resolve it once rather than per file
+    hash_root = version_dir.parent.parent
+    try:
+        for pak_path, pak_info in valid_pak_files:
+            try:
+                pak_key = pak_path.resolve()
+                pak_file = pak_cache.get(pak_key)
+                if pak_file is None:
+                    pak_file = pak_cache[pak_key] = zipfile.ZipFile(pak_path, 'r')
+                
+                # Decide skip-vs-extract from the CRC32 in the PAK's central directory
                 for file_info in pak_info["files"]:
                     xml_name = file_info["name"]
-                    in_pak_dir = file_info["in_pak_dir"]
                     total_files += 1
                     
-                    # Extract the file
-                    output_path, was_extracted = extract_xml_file(
+                    output_path = raw_dir / f"{xml_name}.xml"
+                    rel_path = str(output_path.relative_to(hash_root))
+                    xml_in_pak = f"{file_info['in_pak_dir']}{xml_name}.xml"
+                    # Plain dict lookup in the central directory index, without raising for missing entries
+                    zinfo = pak_file.NameToInfo.get(xml_in_pak)
+                    if zinfo is None:
+                        logger.error(f"File not found in PAK: {xml_in_pak}")
+                        continue
+                    
+                    if is_xml_unchanged(output_path, zinfo, existing_hashes.get(rel_path)):
+                        logger.debug("Skipping %s.xml (unchanged)", xml_name)
+                        extracted_files[xml_name] = output_path if output_path.is_absolute() else output_path.resolve()
+                        skipped_count += 1
+                    else:
+                        # Hand the ZipInfo to the worker so it does not look the entry up again
+                        tasks.append((pak_file, file_info, zinfo, rel_path))
+            except zipfile.BadZipFile:
+                logger.error(f"Invalid PAK file format: {pak_path}")
+            except PermissionError:
+                logger.error(f"Permission denied accessing PAK file: {pak_path}")
+            except Exception as e:
+                logger.error(f"Error processing {pak_path.name}: {e}")
+                logger.debug("Exception details:", exc_info=True)
+        
+        # Remember the config order first; workers record hashes in whatever order they finish
+        hash_order = [rel_path for _, _, _, rel_path in tasks]
+        
+        # Extract the XMLs of every PAK in one pool; decompression releases the GIL.
+        # Submit them in on-disk order so each PAK is read front to back
+        tasks.sort(key=lambda task: (str(task[0].filename), task[2].header_offset))
+        if tasks:
+            with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+                futures = [
+                    executor.submit(
+                        extract_xml_file,
                         pak_file=pak_file,
-                        xml_name=xml_name,
-                        in_pak_dir=in_pak_dir,
+                        zinfo=zinfo,
+                        xml_name=file_info["name"],
+                        in_pak_dir=file_info["in_pak_dir"],
                         raw_dir=raw_dir,
                         xml_dir=xml_dir,
-                        temp_dir=temp_dir,
-                        version_dir=version_dir,
-                        existing_hashes=existing_hashes,
-                        new_hashes=new_hashes
+                        rel_path=rel_path,
+                        new_hashes=new_hashes,
+                        run_ts=run_ts,
+                        parsed_roots=parsed_roots,
+                        results_lock=results_lock
                     )
+                    for pak_file, file_info, zinfo, rel_path in tasks
+                ]
+                
+                # Collect results in submission order so logs stay deterministic
+                for (_, file_info, _, _), future in zip(tasks, futures):
+                    xml_name = file_info["name"]
+                    extracted_path = future.result()
                     
-                    if output_path:
-                        # Store absolute path to avoid confusion with relative paths
-                        extracted_files[xml_name] = output_path.resolve()
-                        logger.debug(f"Stored extracted file path: {xml_name} -> {output_path.resolve()}")
-                        
-                        # Update counters
-                        if was_extracted:
-                            extracted_count += 1
-                        else:
-                            skipped_count += 1
-        except zipfile.BadZipFile:
-            logger.error(f"Invalid PAK file format: {pak_path}")
-        except PermissionError:
-            logger.error(f"Permission denied accessing PAK file: {pak_path}")
-        except Exception as e:
-            logger.error(f"Error processing {pak_path.name}: {e}")
-            logger.debug(f"Exception details:", exc_info=True)
-    
-    # Update hash file
-    if new_hashes:
-        existing_hashes.update(new_hashes)
+                    if extracted_path:
+                        # Store absolute path to avoid confusion with relative paths; root_dir is
+                        # normally resolved already, so only fall back to resolve() when it is not
+                        if not extracted_path.is_absolute():
+                            extracted_path = extracted_path.resolve()
+                        extracted_files[xml_name] = extracted_path
+                        logger.debug("Stored extracted file path: %s -> %s", xml_name, extracted_path)
+                        extracted_count += 1
+    finally:
+        for pak_file in pak_cache.values():
+            pak_file.close()
+    
+    # Keep config order regardless of which files were skipped or extracted
+    config_order = [file_info["name"] for _, pak_info in valid_pak_files for file_info in pak_info["files"]]
+    extracted_files = {name: extracted_files[name] for name in config_order if name in extracted_files}
+    
+    # Update hash file once per run, and only with records whose content changed; never
+    # save per file, which would rewrite the whole file for every extracted XML. Records are
+    # merged in config order so new keys land in the same place on every run
+    changed_hashes = {
+        rel_path: new_hashes[rel_path] for rel_path in hash_order
+        if rel_path in new_hashes and not is_same_hash_record(existing_hashes.get(rel_path), new_hashes[rel_path])
+    }
+    if changed_hashes:
+        existing_hashes.update(changed_hashes)
         write_json(hash_file, existing_hashes)
-        logger.debug(f"Updated file hashes in {hash_file}")
+        logger.debug("Updated file hashes in %s", hash_file)
     
     # Check if we have all required files
     required_files = ["item"]
@@ -250,128 +251,187 @@ def extract_xml_files(kcd2_dir: Path, version_dir: Path, xml_config: Mapping[str
     if missing_files:
         logger.error(f"Missing required XML files: {missing_files}")
         for name, path in extracted_files.items():
-            logger.debug(f"Available file: {name} -> {path}")
+            logger.debug("Available file: %s -> %s", name, path)
     
     # Log summary of extraction process
     logger.info(f"XML extraction summary: {total_files} total files, {extracted_count} extracted, {skipped_count} skipped (unchanged)")
     
-    return extracted_files, xml_dir, temp_dir
+    return extracted_files, xml_dir, parsed_roots
+
+def is_same_hash_record(old_record: Optional[Mapping[str, Any]], new_record: Mapping[str, Any]) -> bool:
+    """
+    Check whether two hash records describe the same PAK entry.
+    
+    The "extracted" timestamp is new on every run, so it is left out of the comparison.
+    
+    Args:
+        old_record: Record stored in the hash file, if any
+        new_record: Record created during this run
+    
+    Returns:
+        True if the records match on everything but the timestamp, False otherwise
+    """
+    return old_record is not None and all(
+        old_record.get(key) == new_record.get(key) for key in ("pak_crc32", "size", "source")
+    )
+
+def is_xml_unchanged(output_path: Path, zinfo: zipfile.ZipInfo, record: Optional[Mapping[str, Any]]) -> bool:
+    """
+    Check whether a previously extracted XML file is still current.
+    
+    The CRC32 and size the PAK stores for the entry are compared against the ones
+    recorded at extraction, and the size against the file on disk, so this costs at
+    most one stat() and no file reads. Records from older formats without them count
+    as changed, so those files are extracted once more.
+    
+    Args:
+        output_path: Path to the extracted XML file
+        zinfo: ZipInfo of the XML file inside the PAK
+        record: Hash record stored for the file on a previous run, if any
+    
+    Returns:
+        True if the file exists and matches its record, False otherwise
+    """
+    if not record or record.get("pak_crc32") != zinfo.CRC or record.get("size") != zinfo.file_size:
+        return False
+    
+    try:
+        return output_path.stat().st_size == zinfo.file_size
+    except OSError:
+        return False
 
 def extract_xml_file(
     pak_file: zipfile.ZipFile, 
+    zinfo: zipfile.ZipInfo,
     xml_name: str, 
     in_pak_dir: str,
     raw_dir: Optional[Path],
     xml_dir: Optional[Path], 
-    temp_dir: Optional[Path], 
-    version_dir: Path, 
-    existing_hashes: Dict[str, Any], 
-    new_hashes: Dict[str, Dict[str, str]]
-) -> Tuple[Optional[Path], bool]:
+    rel_path: str, 
+    new_hashes: Dict[str, Dict[str, Any]],
+    run_ts: str,
+    parsed_roots: Dict[str, ET.Element],
+    results_lock: threading.Lock
+) -> Optional[Path]:
     """
     Extract a single XML file from a PAK file.
     
     Args:
         pak_file: Open ZipFile object for the PAK file
+        zinfo: ZipInfo of the XML file inside the PAK
         xml_name: Name of the XML file without extension
         in_pak_dir: Directory within the PAK file
         raw_dir: Directory to save raw XML files
         xml_dir: Directory for processed XML files
-        temp_dir: Temporary directory for extraction
-        version_dir: Version directory
-        existing_hashes: Dictionary of existing file hashes
-        new_hashes: Dictionary to store new file hashes
+        rel_path: Key of the file's record in the hash file
+        new_hashes: Dictionary to store new hash records
+        run_ts: Timestamp of the extraction run, recorded with the hash
+        parsed_roots: Dictionary to store the parsed root element of the extracted file
+        results_lock: Lock guarding new_hashes and parsed_roots across worker threads
     
     Returns:
-        Tuple containing:
-        - Path to the extracted XML file if successful, None otherwise
-        - Boolean indicating whether the file was freshly extracted (True) or skipped (False)
+        Path to the extracted XML file if successful, None otherwise
     """
-    if not all([raw_dir, xml_dir, temp_dir]):
+    if not all([raw_dir, xml_dir]):
         logger.error("One or more required directories are None")
-        return None, False
+        return None
 
     # Input validation
     if not isinstance(pak_file, zipfile.ZipFile) or not isinstance(xml_name, str):
         logger.error(f"Invalid input parameters for extract_xml_file: {xml_name}")
-        return None, False
+        return None
         
-    if not isinstance(raw_dir, Path) or not isinstance(temp_dir, Path):
+    if not isinstance(raw_dir, Path):
         logger.error(f"Invalid directory paths for extract_xml_file: {xml_name}")
-        return None, False
+        return None
     
     # Setup paths
     xml_in_pak = f"{in_pak_dir}{xml_name}.xml"
     output_path = raw_dir / f"{xml_name}.xml"
     
     try:
-        # Compute relative path for hash tracking
-        rel_path = str(output_path.relative_to(version_dir.parent.parent))
-        
-        # Check if we need to extract based on hash
-        need_extract = True
-        if output_path.exists() and rel_path in existing_hashes:
-            try:
-                current_hash = compute_file_hash(output_path)
-                if current_hash == existing_hashes[rel_path]["xml_hash"]:
-                    logger.debug(f"Skipping {xml_name}.xml (unchanged)")
-                    return output_path, False
-            except (IOError, OSError) as e:
-                logger.warning(f"Error computing hash for {output_path}: {e}")
-                # Continue with extraction as fallback
-        
-        # Clean temp dir before extraction
-        clean_directory(temp_dir)
-        
-        # Extract to temp
-        pak_file.extract(xml_in_pak, temp_dir)
-        extracted_file = temp_dir / xml_in_pak
-        
-        if not extracted_file.exists():
-            logger.error(f"Extraction failed: {xml_in_pak} not found in temp directory")
-            return None, False
-        
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Copy to output path
-        shutil.copy2(extracted_file, output_path)
+        # Read the member once and write it straight to the output path (no temp copy);
+        # the same bytes are parsed below without touching the disk again
+        data = pak_file.read(zinfo)
+        output_path.write_bytes(data)
         
         # Verify the file was copied successfully
         if not output_path.exists() or output_path.stat().st_size == 0:
             logger.error(f"Failed to copy {xml_name}.xml to output path or file is empty")
-            return None, False
+            return None
         
-        # Update hash
-        new_hash = compute_file_hash(output_path)
-        new_hashes[rel_path] = {
-            "xml_hash": new_hash, 
-            "extracted": datetime.now().isoformat(),
-            "source": xml_in_pak
-        }
+        # Parse the in-memory bytes; on failure the caller re-parses from disk and reports the error
+        try:
+            root: Optional[ET.Element] = ET.fromstring(data)
+        except ET.ParseError:
+            root = None
+        
+        # Record the PAK's CRC32 for the entry; the next run compares it without hashing anything
+        with results_lock:
+            if root is not None:
+                parsed_roots[xml_name] = root
+            new_hashes[rel_path] = {
+                "pak_crc32": zinfo.CRC, 
+                "size": zinfo.file_size,
+                "extracted": run_ts,
+                "source": xml_in_pak
+            }
         
         logger.info(f"Extracted {xml_name}.xml to {output_path}")
-        return output_path, True
+        return output_path
         
-    except KeyError:
-        logger.error(f"File not found in PAK: {xml_in_pak}")
-        return None, False
     except (IOError, OSError) as e:
         logger.error(f"I/O error extracting {xml_name}.xml: {e}")
-        return None, False
+        return None
     except Exception as e:
         logger.error(f"Failed to extract {xml_name}.xml: {e}")
-        import traceback
-        logger.debug(traceback.format_exc())
-        return None, False
+        logger.debug("Exception details:", exc_info=True)
+        return None
+
+def load_xml_root(name: str, path: Path, parsed_roots: Optional[Mapping[str, ET.Element]]) -> ET.Element:
+    """
+    Return the root parsed during extraction if there is one, otherwise parse the file.
+    
+    Args:
+        name: Name of the XML file without extension
+        path: Path to the XML file
+        parsed_roots: Root elements already parsed during extraction, keyed by XML name
+    
+    Returns:
+        Root element of the XML file
+    """
+    root = parsed_roots.get(name) if parsed_roots else None
+    return root if root is not None else ET.parse(str(path)).getroot()
 
-def create_combined_items_file(extracted_files: Dict[str, Path], xml_dir: Optional[Path]) -> Tuple[Optional[ET.Element], Optional[Path]]:
+def find_item_classes(root: ET.Element) -> Optional[ET.Element]:
+    """
+    Find the ItemClasses element of an item XML file.
+    
+    Args:
+        root: Root element of the item XML file
+    
+    Returns:
+        The ItemClasses element, or None if the file has none
+    """
+    # ItemClasses is a direct child of <database>; only search deeper if the layout ever changes
+    item_classes = root.find("ItemClasses")
+    return item_classes if item_classes is not None else root.find(".//ItemClasses")
+
+def create_combined_items_file(
+    extracted_files: Dict[str, Path], 
+    xml_dir: Optional[Path], 
+    parsed_roots: Optional[Mapping[str, ET.Element]] = None
+) -> Tuple[Optional[ET.Element], Optional[Path]]:
     """
     Create a combined items XML file from individual XML files.
     
     Args:
         extracted_files: Dictionary mapping XML names to their file paths
         xml_dir: Directory for XML files
+        parsed_roots: Root elements already parsed during extraction, keyed by XML name
     
     Returns:
         Tuple containing:
@@ -395,69 +455,55 @@ def create_combined_items_file(extracted_files: Dict[str, Path], xml_dir: Option
         # Check if required files exist
         if "item" not in extracted_files:
             logger.error("Required file 'item.xml' not found in extracted files")
-            logger.debug(f"Available files: {list(extracted_files.keys())}")
+            logger.debug("Available files: %s", list(extracted_files))
             return None, None
         
         # Parse main item.xml
         item_path = extracted_files["item"]
-        logger.debug(f"Loading item.xml from {item_path}")
+        logger.debug("Loading item.xml from %s", item_path)
         
         if not item_path.exists():
             logger.error(f"File not found: {item_path}")
             return None, None
             
-        main_tree = ET.parse(item_path)
-        main_root = main_tree.getroot()
+        main_root = load_xml_root("item", item_path, parsed_roots)
         
         # Create combined root
-        combined_root = ET.Element(main_root.tag, main_root.attrib)
+        combined_root = ET.Element(main_root.tag, dict(main_root.attrib))
         
         # Find ItemClasses element
-        main_classes = main_root.find(".//ItemClasses")
+        main_classes = find_item_classes(main_root)
         if main_classes is None:
             logger.error("Could not find ItemClasses in item.xml")
             return None, None
         
         # Create ItemClasses element in combined file
-        combined_classes = ET.SubElement(combined_root, "ItemClasses", main_classes.attrib)
+        combined_classes = ET.SubElement(combined_root, "ItemClasses", dict(main_classes.attrib))
         
-        # Process main file items - use extend for better performance
-        for item in main_classes:
-            combined_classes.append(item)
+        # Process main file items in a single bulk append; children are snapshotted first
+        # because lxml moves appended elements, and comments (which lxml keeps) are skipped
+        combined_classes.extend([child for child in main_classes if isinstance(child.tag, str)])
         
         # Track item count for logging
-        item_count = len(list(main_classes))
+        item_count = len(combined_classes)
         
         # Dictionary to track items added from each file
         items_added_by_file: Dict[str, int] = {}
         
-        # Process other files more efficiently
-        for name, path in extracted_files.items():
-            if not name.startswith("item__") or name == "text_ui_items":
-                continue
-                
+        # Process the other item files; roots parsed during extraction never touch the disk
+        other_files = [(name, path) for name, path in extracted_files.items() if name.startswith("item__")]
+        for name, path in other_files:
             try:
-                if not path.exists():
-                    logger.warning(f"File not found: {path}")
-                    continue
-                    
-                file_tree = ET.parse(path)
-                file_root = file_tree.getroot()
-                file_classes = file_root.find(".//ItemClasses")
+                file_root = load_xml_root(name, path, parsed_roots)
+                file_classes = find_item_classes(file_root)
                 
                 if file_classes is None:
                     logger.warning(f"No ItemClasses found in {name}.xml")
                     continue
                 
-                # For better performance, process in batches
-                items_to_add = []
-                for item in file_classes:
-                    # Add all items directly without type conversion
-                    items_to_add.append(item)
-                
-                # Add all items at once for better performance
-                for item in items_to_add:
-                    combined_classes.append(item)
+                # Buffer the items (skipping comments), then add them all at once
+                items_to_add = [child for child in file_classes if isinstance(child.tag, str)]
+                combined_classes.extend(items_to_add)
                 
                 items_added = len(items_to_add)
                 item_count += items_added
@@ -466,15 +512,17 @@ def create_combined_items_file(extracted_files: Dict[str, Path], xml_dir: Option
                 file_type = name.replace('item__', '')
                 items_added_by_file[file_type] = items_added
                 
-                logger.debug(f"Added {items_added} items from {name}.xml")
+                logger.debug("Added %d items from %s.xml", items_added, name)
                 
+            except OSError as e:
+                logger.warning(f"Could not read {path}: {e}")
+                continue
             except ET.ParseError as pe:
                 logger.error(f"XML parse error in {name}.xml: {pe}")
                 return None, None
             except Exception as e:
                 logger.error(f"Error processing {name}.xml: {e}")
-                import traceback
-                logger.debug(traceback.format_exc())
+                logger.debug("Exception details:", exc_info=True)
                 return None, None
         
         # Log summary of added items
@@ -491,8 +539,7 @@ def create_combined_items_file(extracted_files: Dict[str, Path], xml_dir: Option
         return None, None
     except Exception as e:
         logger.error(f"Error creating combined file: {e}")
-        import traceback
-        logger.debug(traceback.format_exc())
+        logger.debug("Exception details:", exc_info=True)
         return None, None
 
 # This allows the module to be run directly for testing
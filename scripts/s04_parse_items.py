@@ -1,10 +1,27 @@
-import copy
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, TypeVar
 from utils import logger, write_json
 
 T = TypeVar('T')  # Define type variable for generic functions
 
+# Item classes dropped before any processing
+_ITEM_CLASSES_TO_REMOVE = frozenset({
+    "AlchemyBase", "Ammo", "CraftingMaterial", "Document", "Food", 
+    "Herb", "MiscItem", "NPCTool", "Ointment", "PickableItem", "Poison"
+})
+
+# Filters used by remove_items; substrings are stored lowercased and matched case-insensitively
+_KEY_FILTERS = tuple(word.lower() for word in ("_empty", "duel", "_broken", "torch"))
+_ICON_FILTERS = tuple(word.lower() for word in ("trafficCone",))
+_UI_NAME_FILTERS = tuple(word.lower() for word in ("_warning",))
+_KV_FILTERS = {"SubClass": frozenset({"5"})}  # key -> values that remove the item
+
+# Target category -> source categories merged into it by condense_categories
+_CATEGORIES_TO_MERGE = {
+    "Armor": ("Armor", "Hood", "Helmet", "QuickSlotContainer"),
+    "Weapons": ("MeleeWeapon", "MissileWeapon")
+}
+
 def parse_items(root_dir: Path, version_id: str, combined_items: Dict[str, Any], 
                text_ui_items: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -32,20 +49,14 @@ def parse_items(root_dir: Path, version_id: str, combined_items: Dict[str, Any],
         logger.warning("No text UI items data provided, display names will be missing")
     
     try:
-        # Create copies of the dictionaries to avoid modifying the originals
-        parsed_items = copy.deepcopy(combined_items)
-        ui_text = copy.deepcopy(text_ui_items)
-        
         # Execute processing steps with error handling
         try:
-            # Remove unwanted item categories
-            item_classes_to_remove = [
-                "AlchemyBase", "Ammo", "CraftingMaterial", "Document", "Food", 
-                "Herb", "MiscItem", "NPCTool", "Ointment", "PickableItem", "Poison"
-            ]
-            for item_class in item_classes_to_remove:
-                if item_class in parsed_items:
-                    del parsed_items[item_class]
+            # Remove unwanted item categories; the originals are never modified because
+            # remove_at_signs below rebuilds every dict and list of the remaining categories
+            parsed_items = {
+                item_class: items for item_class, items in combined_items.items()
+                if item_class not in _ITEM_CLASSES_TO_REMOVE
+            }
 
             # Process items data in steps
             logger.info("Removing @ symbol from keys...")
@@ -53,7 +64,8 @@ def parse_items(root_dir: Path, version_id: str, combined_items: Dict[str, Any],
             if result is None:
                 logger.error("Failed to remove @ signs from keys")
                 return {}
-            parsed_items = result
+            # Give every category the same shape once so later steps can skip per-item type checks
+            parsed_items = _normalize_categories(result)
             
             logger.info("Fixing aliases...")
             result = fix_alias(parsed_items)
@@ -82,7 +94,7 @@ def parse_items(root_dir: Path, version_id: str, combined_items: Dict[str, Any],
             parsed_items = result
 
             logger.info("Adding display names to items...")
-            result = add_display_names(parsed_items, ui_text)
+            result = add_display_names(parsed_items, text_ui_items)
             if result is None:
                 logger.error("Failed to add display names")
                 return {}
@@ -124,17 +136,64 @@ def remove_at_signs(obj: Any) -> Optional[Any]:
         Object with '@' signs removed from dictionary keys or None if error
     """
     try:
-        if isinstance(obj, dict):
-            return {key.lstrip('@'): remove_at_signs(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [remove_at_signs(item) for item in obj]
-        else:
-            return obj
+        return _strip_at_signs(obj)
     except Exception as e:
         logger.error(f"Error removing @ signs: {str(e)}")
         return None
 
 
+def _strip_at_signs(obj: Any) -> Any:
+    """
+    Recursive worker for remove_at_signs, kept free of error handling so a failure
+    deep in the tree aborts the whole pass instead of leaving a None in its place.
+    """
+    # Most keys and leaf values are plain strings, so skip the lstrip and the
+    # recursive call for them instead of paying for both on every node
+    if isinstance(obj, dict):
+        return {
+            key.lstrip('@') if key.startswith('@') else key:
+                value if isinstance(value, str) else _strip_at_signs(value)
+            for key, value in obj.items()
+        }
+    elif isinstance(obj, list):
+        return [item if isinstance(item, str) else _strip_at_signs(item) for item in obj]
+    else:
+        return obj
+
+
+def _normalize_categories(parsed_items: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Turn every category into a list of item dicts.
+    
+    xmltodict returns a category with a single element as a dict instead of a list,
+    and an element without attributes as None or a string. Normalizing once here
+    lets the later steps assume lists of dicts instead of checking every item.
+    
+    Args:
+        parsed_items: Dictionary of items organized by category
+    
+    Returns:
+        Dictionary mapping each category to its list of item dicts
+    """
+    normalized: Dict[str, List[Dict[str, Any]]] = {}
+    dropped_count = 0
+    
+    for category, items in parsed_items.items():
+        if isinstance(items, dict):
+            items = [items]
+        elif not isinstance(items, list):
+            logger.warning(f"Category {category} has no items - leaving it empty")
+            items = []
+        
+        normalized[category] = [item for item in items if isinstance(item, dict)]
+        dropped_count += len(items) - len(normalized[category])
+    
+    if dropped_count:
+        logger.warning(f"Dropped {dropped_count} entries that are not items")
+    
+    return normalized
+
+
 def fix_alias(parsed_items: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Fix aliases in the parsed items by merging source item properties.
@@ -166,9 +225,12 @@ def fix_alias(parsed_items: Dict[str, Any]) -> Optional[Dict[str, Any]]:
                 logger.warning(f"Category {category} is not a list - skipping")
                 continue
                 
-            for item_data in items:
-                if isinstance(item_data, dict) and "Id" in item_data and "Name" in item_data:
-                    source_id_map[item_data["Id"]] = (category, item_data)
+            source_id_map.update({
+                item_id: (category, item_data)
+                for item_data in items
+                if "Name" in item_data
+                and (item_id := item_data.get("Id")) is not None
+            })
         
         # Process each alias item
         if not isinstance(parsed_items["ItemAlias"], list):
@@ -180,7 +242,7 @@ def fix_alias(parsed_items: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         
         # Process each alias item
         for alias_data in parsed_items["ItemAlias"]:
-            if not isinstance(alias_data, dict) or "SourceItemId" not in alias_data or "Name" not in alias_data:
+            if "SourceItemId" not in alias_data or "Name" not in alias_data:
                 aliases_to_keep.append(alias_data)  # Keep invalid aliases for now
                 continue
                 
@@ -198,13 +260,13 @@ def fix_alias(parsed_items: Dict[str, Any]) -> Optional[Dict[str, Any]]:
                 
             source_category, source_item = source_info
                 
-            # Create a copy of the source item
-            merged_item = dict(source_item)
-            
-            # Override with the alias properties (except SourceItemId)
-            for key, value in alias_data.items():
-                if key != "SourceItemId":
-                    merged_item[key] = value
+            # Copy the source item and override it with the alias properties (except SourceItemId).
+            # A shallow copy is enough: the alias only replaces whole top-level keys and later
+            # steps (display names, s05 fill) only assign top-level keys, so nested values shared
+            # with the source item are never mutated. Do not deepcopy here.
+            alias_overrides = dict(alias_data)
+            del alias_overrides["SourceItemId"]
+            merged_item = {**source_item, **alias_overrides}
             
             # Move the alias to the same category as its source
             parsed_items[source_category].append(merged_item)
@@ -237,51 +299,37 @@ def condense_categories(parsed_items: Dict[str, Any]) -> Optional[Dict[str, Any]
         Dictionary with consolidated categories or None if error
     """
     try:
-        categories_to_merge = { 
-            "Armor": ["Armor", "Hood", "Helmet", "QuickSlotContainer"],
-            "Weapons": ["MeleeWeapon", "MissileWeapon"]
-        }
-
-        # Track condensed category counts for logging
-        condensed_item_counts: Dict[str, int] = {}
-
-        for target_category, source_categories in categories_to_merge.items():
-            if target_category not in condensed_item_counts:
-                condensed_item_counts[target_category] = 0
-
-            # Ensure target category exists and is a list
-            if target_category not in parsed_items:
-                parsed_items[target_category] = []
+        for target_category, source_categories in _CATEGORIES_TO_MERGE.items():
+            # Ensure target category exists
+            target_items = parsed_items.setdefault(target_category, [])
+            condensed_count = 0
                 
             for category in source_categories:
                 if category == target_category:
                     continue  # Don't merge a category into itself
                     
-                if category in parsed_items:
-                    # Skip if not a list
-                    if not isinstance(parsed_items[category], list):
-                        logger.warning(f"Category {category} is not a list - skipping")
-                        continue
-                        
-                    # Count items being merged
-                    category_item_count = len(parsed_items[category])
-                    condensed_item_counts[target_category] = condensed_item_counts.get(target_category, 0) + category_item_count
-                    
-                    # Merge the items - extend the target list with source list
-                    parsed_items[target_category].extend(parsed_items[category])
+                category_items = parsed_items.get(category)
+                if category_items is None:
+                    continue
                     
-                    # Remove the source category
-                    del parsed_items[category]
+                # Skip if not a list
+                if not isinstance(category_items, list):
+                    logger.warning(f"Category {category} is not a list - skipping")
+                    continue
                     
-                    logger.debug(f"Merged {category_item_count} items from {category} into {target_category}")
+                # Merge the items and remove the source category
+                target_items.extend(category_items)
+                del parsed_items[category]
+                condensed_count += len(category_items)
+                
+                logger.debug(f"Merged {len(category_items)} items from {category} into {target_category}")
 
-        # Log summary of condensation
-        for category, count in condensed_item_counts.items():
-            if count > 0:
-                logger.info(f"Condensed {count} items into {category} category")
+            if condensed_count > 0:
+                logger.info(f"Condensed {condensed_count} items into {target_category} category")
         
-        # Move "Weapons" category to the first key in the dictionary
-        if "Weapons" in parsed_items:
+        # Move "Weapons" category to the first key in the dictionary; the rebuild only copies
+        # references to the category lists, and is skipped when Weapons already comes first
+        if "Weapons" in parsed_items and next(iter(parsed_items)) != "Weapons":
             weapons_data = parsed_items.pop("Weapons")
             parsed_items = {"Weapons": weapons_data, **parsed_items}
 
@@ -305,12 +353,6 @@ def remove_items(parsed_items: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         Dictionary with unnecessary items removed or None if error
     """
     try:
-        # Define filters as constants
-        KEY_FILTERS = ["_empty", "duel", "_broken", "torch"]
-        ICON_FILTERS = ["trafficCone"]
-        UI_NAME_FILTERS = ["_warning"]
-        KV_FILTERS = [{"key": "SubClass", "value": "5"}]
-        
         # Counters for logging
         removed_counts = {
             "key_filter": 0,
@@ -325,46 +367,8 @@ def remove_items(parsed_items: Dict[str, Any]) -> Optional[Dict[str, Any]]:
                 logger.warning(f"Category {category} is not a list - skipping")
                 continue
                 
-            # Create a new list to keep only the items we want
-            filtered_items = []
-            
-            for item in items:
-                # Skip non-dictionary items
-                if not isinstance(item, dict) or "Name" not in item:
-                    filtered_items.append(item)  # Keep items without Name
-                    continue
-                    
-                item_name = item["Name"]
-                should_keep = True
-                
-                # Check key-value filters
-                for kv_filter in KV_FILTERS:
-                    filter_key = kv_filter["key"]
-                    filter_value = kv_filter["value"]
-                    
-                    if filter_key in item and str(item[filter_key]) == filter_value:
-                        should_keep = False
-                        removed_counts["kv_filter"] += 1
-                        break
-                
-                # Check other filters if the item wasn't already flagged for removal
-                if should_keep:
-                    if any(filter_word.lower() in item_name.lower() for filter_word in KEY_FILTERS):
-                        should_keep = False
-                        removed_counts["key_filter"] += 1
-                    elif any(filter_word.lower() in item.get("IconId", "").lower() for filter_word in ICON_FILTERS):
-                        should_keep = False
-                        removed_counts["icon_filter"] += 1
-                    elif any(filter_word.lower() in item.get("UIName", "").lower() for filter_word in UI_NAME_FILTERS):
-                        should_keep = False
-                        removed_counts["ui_name_filter"] += 1
-                
-                # Keep the item if it passed all filters
-                if should_keep:
-                    filtered_items.append(item)
-            
-            # Replace the original list with the filtered list
-            parsed_items[category] = filtered_items
+            # Replace the original list with only the items we want to keep
+            parsed_items[category] = [item for item in items if _keep_item(item, removed_counts)]
 
         # Log results
         total_removed = sum(removed_counts.values())
@@ -374,7 +378,7 @@ def remove_items(parsed_items: Dict[str, Any]) -> Optional[Dict[str, Any]]:
                 if count > 0:
                     if filter_type == "kv_filter":
                         # FIX: Remove the extra square brackets that were causing the error
-                        kv_details = ", ".join(f"{kv['key']}={kv['value']}" for kv in KV_FILTERS)
+                        kv_details = ", ".join(f"{key}={value}" for key, values in _KV_FILTERS.items() for value in sorted(values))
                         logger.info(f"  - {count} items with {kv_details}")
                     else:
                         logger.info(f"  - {count} items by {filter_type.replace('_', ' ')}")
@@ -388,6 +392,49 @@ def remove_items(parsed_items: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _keep_item(item: Dict[str, Any], removed_counts: Dict[str, int]) -> bool:
+    """
+    Check an item against the remove_items filters, counting the filter that removed it.
+    
+    Args:
+        item: Item to check
+        removed_counts: Counters of removed items per filter, updated in place
+    
+    Returns:
+        True if the item should be kept, False otherwise
+    """
+    if "Name" not in item:
+        return True  # Keep items without Name
+    
+    # Check key-value filters
+    for filter_key, blocked_values in _KV_FILTERS.items():
+        value = item.get(filter_key)
+        if value is not None and (value if isinstance(value, str) else str(value)) in blocked_values:
+            removed_counts["kv_filter"] += 1
+            return False
+    
+    # Each field is lowercased once and only when its filter is reached
+    name_lc = item["Name"].lower()
+    for filter_word in _KEY_FILTERS:
+        if filter_word in name_lc:
+            removed_counts["key_filter"] += 1
+            return False
+    
+    icon_lc = item.get("IconId", "").lower()
+    for filter_word in _ICON_FILTERS:
+        if filter_word in icon_lc:
+            removed_counts["icon_filter"] += 1
+            return False
+    
+    ui_name_lc = item.get("UIName", "").lower()
+    for filter_word in _UI_NAME_FILTERS:
+        if filter_word in ui_name_lc:
+            removed_counts["ui_name_filter"] += 1
+            return False
+    
+    return True
+
+
 def add_display_names(parsed_items: Dict[str, Any], ui_text: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Add display names to items based on their UIName or other properties.
@@ -404,34 +451,8 @@ def add_display_names(parsed_items: Dict[str, Any], ui_text: Dict[str, Any]) ->
         display_names_found = 0
         display_names_missing = 0
         
-        def proper_title_case(text: str) -> str:
-            """
-            Properly capitalize text while respecting apostrophes and other punctuation.
-            """
-            if not text:
-                return text
-                
-            words = text.split()
-            capitalized_words: List[str] = []  # Add proper type annotation
-            
-            for word in words:
-                if not word:
-                    # Empty string - add it as is
-                    capitalized_words.append(word)
-                    continue
-                    
-                # Handle apostrophes specially
-                apostrophe_pos = word.find("'")
-                if apostrophe_pos > 0 and apostrophe_pos < len(word) - 1:
-                    # Capitalize first part before apostrophe
-                    word = word[0].upper() + word[1:apostrophe_pos+1] + word[apostrophe_pos+1].lower() + word[apostrophe_pos+2:]
-                else:
-                    # Normal capitalization
-                    word = word[0].upper() + word[1:].lower()
-                    
-                capitalized_words.append(word)
-                
-            return " ".join(capitalized_words)
+        # Many items share a UIName, so resolve and title-case each one only once
+        display_names: Dict[str, str] = {}
         
         # Iterate through all categories
         for category, items in parsed_items.items():
@@ -443,18 +464,16 @@ def add_display_names(parsed_items: Dict[str, Any], ui_text: Dict[str, Any]) ->
             for item in items:
                 items_processed += 1
                 
-                if not isinstance(item, dict):
-                    continue
-                    
-                if "UIName" not in item:
+                ui_name = item.get("UIName")
+                
+                # Look up in text dictionary
+                if ui_name is None or ui_name not in ui_text:
                     item["DisplayName"] = "Null"
                     display_names_missing += 1
                     continue
                 
-                ui_name = item["UIName"]
-                
-                # Look up in text dictionary
-                if ui_name in ui_text:
+                display_name = display_names.get(ui_name)
+                if display_name is None:
                     text_array = ui_text[ui_name]
                     
                     # Use second element if available, otherwise first
@@ -465,12 +484,11 @@ def add_display_names(parsed_items: Dict[str, Any], ui_text: Dict[str, Any]) ->
                     else:
                         display_name = "Null"
                     
-                    # Apply title case and set
-                    item["DisplayName"] = proper_title_case(display_name)
-                    display_names_found += 1
-                else:
-                    item["DisplayName"] = "Null"
-                    display_names_missing += 1
+                    # Apply title case once per UIName
+                    display_name = display_names[ui_name] = _proper_title_case(display_name)
+                
+                item["DisplayName"] = display_name
+                display_names_found += 1
         
         # Log results
         logger.info(f"Processed {items_processed} items")
@@ -483,4 +501,34 @@ def add_display_names(parsed_items: Dict[str, Any], ui_text: Dict[str, Any]) ->
         logger.error(f"Error adding display names: {str(e)}")
         import traceback
         logger.debug(traceback.format_exc())
-        return None
\ No newline at end of file
+        return None
+
+
+def _proper_title_case(text: str) -> str:
+    """
+    Properly capitalize text while respecting apostrophes and other punctuation.
+    """
+    if not text:
+        return text
+        
+    words = text.split()
+    capitalized_words: List[str] = []  # Add proper type annotation
+    
+    for word in words:
+        if not word:
+            # Empty string - add it as is
+            capitalized_words.append(word)
+            continue
+            
+        # Handle apostrophes specially
+        apostrophe_pos = word.find("'")
+        if apostrophe_pos > 0 and apostrophe_pos < len(word) - 1:
+            # Capitalize first part before apostrophe
+            word = word[0].upper() + word[1:apostrophe_pos+1] + word[apostrophe_pos+1].lower() + word[apostrophe_pos+2:]
+        else:
+            # Normal capitalization
+            word = word[0].upper() + word[1:].lower()
+            
+        capitalized_words.append(word)
+        
+    return " ".join(capitalized_words)
\ No newline at end of file
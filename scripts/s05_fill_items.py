@@ -1,4 +1,3 @@
-import copy
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 
@@ -35,11 +34,14 @@ def fill_item_properties(
     version_dir = root_dir / "data" / "version" / version_id
     logger.info("Categorizing items...")
 
-    # Create a deep copy to avoid modifying the original
+    # Copy the category lists and item dicts to avoid modifying the original. The fill
+    # steps only set or pop top-level item keys, so nested values can be shared; a deep
+    # copy would duplicate every one of them for nothing
     try:
-        filled_items = copy.deepcopy(parsed_items)
+        filled_items = {category: [dict(item) for item in items] for category, items in parsed_items.items()}
     except Exception as e:
-        logger.error(f"Failed to create a deep copy of parsed_items: {str(e)}")
+        logger.error(f"Failed to copy parsed_items: {str(e)}")
+        import traceback
         logger.debug(traceback.format_exc())
         return {}
 
@@ -0,0 +1,92 @@
+"""
+Tests for the XML extraction step (s03_get_xml.py).
+Builds a small synthetic PAK and checks which entries are extracted or skipped between runs.
+"""
+import sys
+import logging
+import zipfile
+import pytest
+from pathlib import Path
+
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.s03_get_xml import extract_xml_files
+
+IN_PAK_DIR = "Libs/Tables/item/"
+XML_NAMES = ["item", "item__dlc", "item__horse"]
+
+def write_pak(pak_path, contents):
+    """Write a PAK (zip) holding one XML entry per name in contents."""
+    with zipfile.ZipFile(pak_path, "w", zipfile.ZIP_DEFLATED) as pak:
+        for name, xml in contents.items():
+            pak.writestr(f"{IN_PAK_DIR}{name}.xml", xml)
+
+@pytest.fixture
+def kcd2_dir(tmp_path):
+    """Return a fake KCD2 directory holding Tables.pak with every configured XML."""
+    kcd2_dir = tmp_path / "kcd2"
+    kcd2_dir.mkdir()
+    write_pak(kcd2_dir / "Tables.pak", {name: f"<{name}><Item Id='1'/></{name}>" for name in XML_NAMES})
+    return kcd2_dir
+
+@pytest.fixture
+def version_dir(tmp_path):
+    """Return the version directory the XMLs are extracted into."""
+    return tmp_path / "data" / "version" / "1_2"
+
+@pytest.fixture
+def xml_config():
+    """Return an XML config in the format of xml_config.json."""
+    return {
+        "tables": {
+            "kcd2_pak_file": "Tables.pak",
+            "files": [{"name": name, "in_pak_dir": IN_PAK_DIR} for name in XML_NAMES],
+        }
+    }
+
+def test_cold_run_extracts_every_file(kcd2_dir, version_dir, xml_config):
+    extracted_files, _, parsed_roots = extract_xml_files(kcd2_dir, version_dir, xml_config)
+
+    assert list(extracted_files) == XML_NAMES
+    assert set(parsed_roots) == set(XML_NAMES)
+    for name in XML_NAMES:
+        assert (version_dir / "xml" / "raw" / f"{name}.xml").exists()
+    assert (version_dir / "xml" / "file_hashes.json").exists()
+
+def test_warm_run_skips_every_file(kcd2_dir, version_dir, xml_config):
+    extract_xml_files(kcd2_dir, version_dir, xml_config)
+    hash_file = version_dir / "xml" / "file_hashes.json"
+    hashes_before = hash_file.read_bytes()
+    mtime_before = hash_file.stat().st_mtime_ns
+
+    extracted_files, _, parsed_roots = extract_xml_files(kcd2_dir, version_dir, xml_config)
+
+    # Skipped files are still returned, but none of them is parsed again
+    assert list(extracted_files) == XML_NAMES
+    assert parsed_roots == {}
+    assert hash_file.read_bytes() == hashes_before
+    assert hash_file.stat().st_mtime_ns == mtime_before
+
+def test_changed_entry_is_extracted_again(kcd2_dir, version_dir, xml_config):
+    extract_xml_files(kcd2_dir, version_dir, xml_config)
+    contents = {name: f"<{name}><Item Id='1'/></{name}>" for name in XML_NAMES}
+    contents["item__dlc"] = "<item__dlc><Item Id='2'/><Item Id='3'/></item__dlc>"
+    write_pak(kcd2_dir / "Tables.pak", contents)
+
+    extracted_files, _, parsed_roots = extract_xml_files(kcd2_dir, version_dir, xml_config)
+
+    assert list(extracted_files) == XML_NAMES
+    assert list(parsed_roots) == ["item__dlc"]
+    raw_file = version_dir / "xml" / "raw" / "item__dlc.xml"
+    assert raw_file.read_text(encoding="utf-8") == contents["item__dlc"]
+
+def test_missing_entry_is_logged_and_skipped(kcd2_dir, version_dir, xml_config, caplog):
+    xml_config["tables"]["files"].append({"name": "item__missing", "in_pak_dir": IN_PAK_DIR})
+
+    with caplog.at_level(logging.ERROR):
+        extracted_files, _, _ = extract_xml_files(kcd2_dir, version_dir, xml_config)
+
+    assert list(extracted_files) == XML_NAMES
+    assert f"File not found in PAK: {IN_PAK_DIR}item__missing.xml" in caplog.text
+    assert not (version_dir / "xml" / "raw" / "item__missing.xml").exists()
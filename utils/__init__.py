@@ -1,5 +1,5 @@
 from .logger import logger
 from .data_json_helpers import save_data_json, load_data_json
-from .json_helpers import read_json, write_json, unwrap_key, xform_ui_dict
+from .json_helpers import read_json, read_json_cached, write_json, unwrap_key, xform_ui_dict
 from .helpers import ensure_dir, rel_path
 from .xml_helpers import xml_tree_to_dict, format_xml, convert_xml, convert_xml
\ No newline at end of file
@@ -1,8 +1,16 @@
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from .logger import logger
 
+try:
+    # orjson is optional but parses and serializes several times faster
+    import orjson  # type: ignore[import-not-found]
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 def read_json(file_path: Path) -> Optional[Dict[str, Any]]:
     """
     Read and parse a JSON file.
@@ -18,19 +26,55 @@ def read_json(file_path: Path) -> Optional[Dict[str, Any]]:
             logger.warning(f"File not found: {file_path}")
             return None
             
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            # Explicitly return the typed value to help Mypy
-            return data if isinstance(data, dict) else None
+        if orjson is not None:
+            data = orjson.loads(file_path.read_bytes())
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        
+        # Explicitly return the typed value to help Mypy
+        return data if isinstance(data, dict) else None
             
     except Exception as e:
         logger.error(f"Error reading JSON file {file_path}: {e}")
         return None
 
+def read_json_cached(file_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Read and parse a JSON file, reusing the parsed data while the file is unchanged.
+
+    The cache is keyed by path, modification time and size, so rewriting the file
+    invalidates it. The returned dict is shared between calls and must not be modified;
+    copy it first if it needs changing.
+
+    Args:
+        file_path: Path to the JSON file
+
+    Returns:
+        dict: Parsed JSON data or None if an error occurred
+    """
+    try:
+        stat = file_path.stat()
+    except OSError:
+        # Let read_json report the missing or unreadable file
+        return read_json(file_path)
+    return _read_json_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=64)
+def _read_json_cached(path_str: str, _mtime_ns: int, _size: int) -> Optional[Dict[str, Any]]:
+    # The modification time and size only take part in the cache key
+    return read_json(Path(path_str))
+
 def write_json(file_path: Path, data: Any, indent: int = 4) -> bool:
     """
     Write data to a JSON file.
 
+    orjson is used when available and the requested indent is one it supports
+    (compact or 2 spaces), and the stdlib fallback for those indents writes the same
+    bytes; other indents go through the stdlib json module unchanged. The data
+    is written to a temporary file next to the target and renamed over it, so an
+    interrupted write never leaves a truncated file behind.
+
     Args:
         file_path: Path to the JSON file to write
         data: The data to write to the JSON file
@@ -39,16 +83,32 @@ def write_json(file_path: Path, data: Any, indent: int = 4) -> bool:
     Returns:
         bool: True if the file was written successfully, False if an error occurred
     """
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
     try:
         # Ensure directory exists
         file_path.parent.mkdir(parents=True, exist_ok=True)
             
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=indent)
+        if indent in (None, 2):
+            # Write the same bytes whether or not orjson is installed: raw UTF-8 rather
+            # than \u escapes, and orjson's separators when compact
+            if orjson is not None:
+                option = orjson.OPT_NON_STR_KEYS
+                if indent:
+                    option |= orjson.OPT_INDENT_2
+                tmp_path.write_bytes(orjson.dumps(data, option=option))
+            else:
+                separators = (",", ":") if indent is None else None
+                text = json.dumps(data, indent=indent, ensure_ascii=False, separators=separators)
+                tmp_path.write_bytes(text.encode("utf-8"))
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=indent)
+        os.replace(tmp_path, file_path)
         return True
             
     except Exception as e:
         logger.error(f"Error writing JSON file {file_path}: {e}")
+        tmp_path.unlink(missing_ok=True)
         return False
     
 def unwrap_key(data: Any, key: str) -> Any:
@@ -1,11 +1,16 @@
-import xml.etree.ElementTree as ET
 import xmltodict
 from .logger import logger
 from .json_helpers import unwrap_key, xform_ui_dict
 
+try:
+    # Use the same backend as s03_get_xml so its elements can be serialized here
+    from lxml import etree as ET  # type: ignore[import-untyped]
+except ImportError:
+    import xml.etree.ElementTree as ET  # type: ignore[no-redef]
+
 def xml_tree_to_dict(elem):
     """
-    Given an xml.etree.ElementTree.Element, return a native Python dict.
+    Given an ElementTree (or lxml) Element, return a native Python dict.
     """
     # xmltodict wants bytes or string; serialize just the subtree
     xml_str = ET.tostring(elem, encoding="utf-8")
@@ -15,6 +20,8 @@ def format_xml(xml_element):
     """
     Format XML with proper indentation and without excessive blank lines.
     
+    Without lxml, element inputs are indented in place.
+    
     Args:
         xml_element: ElementTree element or XML string
         
@@ -27,8 +34,10 @@ def format_xml(xml_element):
         # If lxml is available, use it for better formatting
         from lxml import etree as lxml_etree
         
-        # Convert to string if it's an ElementTree element
-        if isinstance(xml_element, ET.Element):
+        # Convert to string if it's an lxml or ElementTree element
+        if lxml_etree.iselement(xml_element):
+            xml_str = lxml_etree.tostring(xml_element, encoding='utf-8')
+        elif isinstance(xml_element, ET.Element):
             xml_str = ET.tostring(xml_element, encoding='utf-8')
         else:
             xml_str = xml_element
@@ -40,21 +49,15 @@ def format_xml(xml_element):
         # Format with proper indentation
         return lxml_etree.tostring(elem, encoding='utf-8', pretty_print=True)
     except ImportError:
-        # Fallback to minidom with regex cleanup for excessive blank lines
-        import xml.dom.minidom
-        import re
-        
-        # Convert to string if it's an ElementTree element
+        # Fallback to ElementTree's own indenter (no minidom DOM round-trip)
         if isinstance(xml_element, ET.Element):
-            xml_str = ET.tostring(xml_element, encoding='utf-8')
+            elem = xml_element
         else:
-            xml_str = xml_element
-            
-        # Use minidom for basic formatting
-        pretty_xml = xml.dom.minidom.parseString(xml_str).toprettyxml(indent="  ")
+            elem = ET.fromstring(xml_element)
         
-        # Remove excessive blank lines
-        return re.sub(r'>\s*\n\s*\n+', '>\n', pretty_xml.encode('utf-8'))
+        # Indents in place, so element inputs come back formatted as well
+        ET.indent(elem, space="  ")
+        return ET.tostring(elem, encoding='utf-8', xml_declaration=True)
 
 def convert_xml(xml_trees):
     """